@@ -20,6 +20,8 @@ class DataTransfer:
         # create table
         if tname not in database.get_all_tables_name():
             database.create_table(tname, PrimaryKey.id_as_primary(), self.fields)
+        else:
+            database.ensure_indexes(tname, self.fields)
 
     def data_to_msg(self, data):
         """turn data fetched from database to MsgWithTag instance
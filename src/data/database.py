@@ -2,21 +2,36 @@
 # -*- coding:utf-8 -*-
 """designed API for database"""
 import sqlite3
-import pickle
+import queue
+import json
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict
+
+# table storing json descriptors of tables
+META_TABLE = '__meta'
+# max number of cached search results
+SEARCH_CACHE_SIZE = 128
+# seconds to wait for a free connection of pool
+POOL_TIMEOUT = 5
 
 
 class Field:
     """class of a field in database"""
-    def __init__(self, name, dtype, null=True, others=None):
+    # pylint: disable=R0913
+    def __init__(self, name, dtype, null=True, others=None, indexed=False):
         """attributes:
             name: name of field
             dtype: data type
             null: can be null or not
-            others: other attributes"""
+            others: other attributes
+            indexed: create index on this field or not"""
         self.name = name
         self.dtype = dtype
         self.null = null
         self.others = others
+        self.indexed = indexed
 
     def to_list(self):
         """turn attributes to list"""
@@ -60,6 +75,44 @@ class Table:
         self.fields = {}
         for field in [primary] + fields:
             self.fields[field.name] = field
+        # text and char() fields are bound as str
+        self._is_text_field = {}
+        for name, field in self.fields.items():
+            dtype = field.dtype.lower()
+            self._is_text_field[name] = dtype == 'text' or dtype.find('char') != -1
+        self.field_names = tuple(self.fields)
+        self.field_names_csv = ','.join(self.field_names)
+        # sql statements keyed by their shape, frequently used ones are built
+        # here and others are cached on first use by Database. Insert statements
+        # are keyed by inserted fields, None columns mean all fields
+        self.sql: Dict[tuple, str] = {}
+        for names in [self.field_names, self.field_names[1:]]:
+            self.sql[('insert', names)] = (f'INSERT INTO {tname} ({",".join(names)}) '
+                                           f'VALUES ({",".join("?" * len(names))})')
+        self.sql[('select', None)] = f'SELECT {self.field_names_csv} from {tname}'
+        names = self.field_names[1:]
+        self.sql[('update', names, primary.name)] = (f'UPDATE {tname} set '
+                                                     f'{"=?,".join(names)}=? '
+                                                     f'where {primary.name}=?;')
+        for name in self.field_names:
+            self.sql[('search', None, name)] = (f'SELECT {self.field_names_csv} '
+                                                f'from {tname} where {name}=?')
+            self.sql[('delete', name)] = f'DELETE from {tname} where {name}=?'
+
+    def to_dict(self):
+        """turn table information to dictionary"""
+        fields = list(self.fields.values())
+        return {'primary': fields[0].__dict__,
+                'fields': [field.__dict__ for field in fields[1:]]}
+
+    @classmethod
+    def from_dict(cls, tname, data):
+        """create instance from dictionary
+        params:
+            tname: name of table
+            data: dict"""
+        return Table(tname, PrimaryKey(**data['primary']),
+                     [Field(**field) for field in data['fields']])
 
     def get_field(self, fname):
         """return selected field info
@@ -73,48 +126,235 @@ class Table:
 
     def get_all_fields_name(self):
         """return all fields name"""
-        return list(self.fields.keys())
+        return self.field_names
 
-    def revise_data(self, field, value):
-        """to surround text and char() type data with
-           a pair of ''
+    def adapt_data(self, field, value):
+        """turn text and char() type data into str before binding
         params:
             field: name of field
             value: raw value"""
-        dtype = self.get_field(field).dtype.lower()
-        if dtype == 'text' or dtype.find('char') != -1:
-            value = f'\'{value}\''
+        if self._is_text_field[field]:
+            value = str(value)
         return value
 
+    def adapt_rows(self, keys, rows):
+        """adapt_data for each value of rows
+        params:
+            keys: name of fields
+            rows: list of values, each corresponds to keys"""
+        is_text = [self._is_text_field[key] for key in keys]
+        return [[str(value) if text else value
+                 for value, text in zip(row, is_text)] for row in rows]
+
+    def range_params(self, field, start, end):
+        """parameters of Database.range_condition, None bounds are skipped
+        params:
+            field: name of field
+            start: left value of the field
+            end: right value of the field"""
+        return tuple(self.adapt_data(field, value)
+                     for value in (start, end) if value is not None)
+
+
+class ConnectionPool:
+    """pool of sqlite connections, one writer and several readers,
+       as sqlite allows only one writer at a time in WAL mode"""
+    def __init__(self, path, readers=4, timeout=POOL_TIMEOUT):
+        """params:
+            path: path of data file
+            readers: number of read-only connections, at least 1
+            timeout: seconds to wait for a free connection"""
+        if readers < 1:
+            raise ValueError(f'at least 1 reader is needed, got {readers}')
+        self.timeout = timeout
+        self._closed = False
+        self._writers = queue.Queue(maxsize=1)
+        self._writers.put(self.connect(path))
+        # readers must be opened after the writer has created the file
+        self._uri = Path(path).absolute().as_uri() + '?mode=ro'
+        self._readers = queue.Queue(maxsize=readers)
+        for _ in range(readers):
+            self._readers.put(self.connect(self._uri, uri=True))
+
+    @classmethod
+    def connect(cls, path, uri=False):
+        """open a connection shared by threads and tune it
+        params:
+            path: path of data file, or uri if uri is True
+            uri: whether path is an uri"""
+        conn = sqlite3.connect(path, check_same_thread=False, uri=uri)
+        # WAL journal so that commits do not fsync the whole database
+        if not uri:
+            conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-64000')
+        conn.execute('PRAGMA busy_timeout=5000')
+        return conn
+
+    @contextmanager
+    def reader(self):
+        """borrow a read-only connection"""
+        conn = self.borrow(self._readers)
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def writer(self):
+        """borrow the only writable connection, uncommitted changes are
+           rolled back if an error occurs"""
+        conn = self.borrow(self._writers)
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._writers.put(conn)
+
+    def open_reader(self):
+        """open a read-only connection outside the pool, which must be closed
+           by the caller"""
+        if self._closed:
+            raise sqlite3.ProgrammingError('Cannot operate on a closed database.')
+        return self.connect(self._uri, uri=True)
+
+    def borrow(self, conns):
+        """take a connection from conns, raise error instead of waiting
+           forever if the pool is closed or exhausted
+        params:
+            conns: queue of connections"""
+        if self._closed:
+            raise sqlite3.ProgrammingError('Cannot operate on a closed database.')
+        try:
+            return conns.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(f'no free connection in pool after '
+                                           f'{self.timeout} seconds') from None
+
+    def close(self):
+        """close all connections, the writer is closed last so that it can
+           checkpoint and remove the WAL file"""
+        self._closed = True
+        for conns in [self._readers, self._writers]:
+            while not conns.empty():
+                conns.get().close()
+
 
 class Database:
     """use sqlite as database"""
-    def __init__(self, path, config_path='database_config.pkl'):
+    def __init__(self, path, readers=4, cache=False):
         """params:
             path: path of data file
-            cofig_path: path of database config file"""
+            readers: number of read-only connections
+            cache: cache results of search, only changes made through
+                   this instance invalidate the cache"""
         # data path
         self.path = path
-        # connect to sqlite
-        self.conn = sqlite3.connect(path)
-        # store tables and their fields for type checking
-        try:
-            with open(config_path, 'rb') as config:
-                self.tables = pickle.load(config)
-        except FileNotFoundError:
-            self.tables = {}
-        self.config_path = config_path
+        # connections are kept open until close()
+        self.pool = ConnectionPool(path, readers)
+        # LRU cache of search results, None if cache is disabled
+        self._search_cache = OrderedDict() if cache else None
+        # tables and their fields for type checking, read from descriptors in
+        # META_TABLE, tables without descriptor are rebuilt from sqlite schema
+        with self.pool.writer() as conn:
+            conn.execute(f'CREATE TABLE IF NOT EXISTS {META_TABLE} '
+                         f'(key TEXT PRIMARY KEY, value TEXT)')
+        self.tables = {}
+        # tables whose descriptor is not stored yet, saved once on close()
+        self._tables_dirty = False
+        stale = []
+        with self.pool.reader() as conn:
+            cursor = conn.execute('SELECT name FROM sqlite_master WHERE '
+                                  'type=\'table\' AND name NOT LIKE \'sqlite_%\'')
+            existing = [tname for (tname,) in cursor.fetchall() if tname != META_TABLE]
+            cursor = conn.execute(f'SELECT key, value from {META_TABLE} '
+                                  f'where key LIKE \'table:%\'')
+            for key, value in cursor.fetchall():
+                tname = key[len('table:'):]
+                # descriptors of tables dropped outside this class are removed
+                if tname in existing:
+                    self.tables[tname] = Table.from_dict(tname, json.loads(value))
+                else:
+                    stale.append((key,))
+            for tname in existing:
+                if tname not in self.tables:
+                    table = self.load_table(conn, tname)
+                    # tables not created by this class are skipped
+                    if table is not None:
+                        self.tables[tname] = table
+                        self._tables_dirty = True
+        if stale:
+            with self.pool.writer() as conn:
+                conn.executemany(f'DELETE from {META_TABLE} where key=?', stale)
+                conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
         self.close()
 
-    def connect(self):
-        """reconnect to database"""
-        self.conn = sqlite3.connect(self.path)
+    def __del__(self):
+        try:
+            self.pool.close()
+        except AttributeError:
+            pass
+
+    @classmethod
+    def load_table(cls, conn, tname):
+        """rebuild Table from schema stored in sqlite, return None if the
+           table does not have exactly one primary key column
+        params:
+            conn: connection to database
+            tname: name of table"""
+        primaries, fields = [], []
+        cursor = conn.execute('SELECT name FROM sqlite_master WHERE '
+                              'type=\'index\' AND tbl_name=?', (tname,))
+        indexes = [index for (index,) in cursor.fetchall()]
+        cursor = conn.execute(f'PRAGMA table_info({tname})')
+        for _, name, dtype, notnull, default, is_primary in cursor.fetchall():
+            others = None if default is None else [f'DEFAULT ({default})']
+            if is_primary:
+                primaries.append(PrimaryKey(name, dtype, not notnull, others))
+            else:
+                fields.append(Field(name, dtype, not notnull, others,
+                                    cls.index_name(tname, name) in indexes))
+        if len(primaries) != 1:
+            return None
+        return Table(tname, primaries[0], fields)
+
+    @classmethod
+    def index_name(cls, tname, fname):
+        """return name of index created on field
+        params:
+            tname: name of table
+            fname: name of field"""
+        return f'idx_{tname}_{fname}'
+
+    def save_tables(self):
+        """store descriptors of all tables"""
+        with self.pool.writer() as conn:
+            conn.execute('BEGIN')
+            conn.executemany(f'INSERT OR REPLACE INTO {META_TABLE} '
+                             f'VALUES (\'table:\' || ?, ?)',
+                             [(tname, json.dumps(table.to_dict()))
+                              for tname, table in self.tables.items()])
+            conn.commit()
+        self._tables_dirty = False
 
     def close(self):
-        """close current connection to save changes to file"""
-        self.conn.close()
-        with open(self.config_path, 'wb') as fout:
-            pickle.dump(self.tables, fout)
+        """close all connections, descriptors of tables are saved if needed"""
+        if self._tables_dirty:
+            self.save_tables()
+        self.pool.close()
+
+    def clear_search_cache(self):
+        """drop cached search results after modification"""
+        if self._search_cache is not None:
+            self._search_cache.clear()
 
     def get_all_tables_name(self):
         """return list of name of tables"""
@@ -127,15 +367,56 @@ class Database:
             primary: attributes of primary key
             fields: list of fields, each is a list
         """
-        self.connect()
-        cursor = self.conn.cursor()
-        cursor.execute(f'CREATE TABLE {tname}'
-                       f'({primary.to_str()}, '
-                       f'{",".join([field.to_str() for field in fields])});')
-        self.conn.commit()
+        table = Table(tname, primary, fields)
+        ddl = [f'CREATE TABLE {tname}'
+               f'({primary.to_str()}, '
+               f'{",".join([field.to_str() for field in fields])});']
+        for field in fields:
+            if field.indexed:
+                ddl.append(f'CREATE INDEX IF NOT EXISTS '
+                           f'{self.index_name(tname, field.name)} '
+                           f'ON {tname}({field.name});')
+        with self.pool.writer() as conn:
+            # table, indexes and descriptor are created in one transaction,
+            # the transaction is left open by the script for the descriptor
+            conn.executescript('BEGIN;' + ''.join(ddl))
+            # store table descriptor
+            conn.execute(f'INSERT OR REPLACE INTO {META_TABLE} '
+                         f'VALUES (\'table:\' || ?, ?)',
+                         (tname, json.dumps(table.to_dict())))
+            conn.commit()
         # store table locally
-        self.tables[tname] = Table(tname, primary, fields)
-        self.close()
+        self.tables[tname] = table
+
+    def ensure_indexes(self, tname, fields):
+        """create missing indexes of fields declared as indexed on existing table
+        params:
+            tname: name of the table
+            fields: list of fields"""
+        table = self.tables[tname]
+        unknown = [field.name for field in fields if field.name not in table.fields]
+        if unknown:
+            raise ValueError(f'fields {unknown} do not exist in table {tname}')
+        missing = [field.name for field in fields
+                   if field.indexed and not table.get_field(field.name).indexed]
+        if not missing:
+            return
+        # descriptor with new indexes, table is updated only after commit
+        descriptor = table.to_dict()
+        descriptor['fields'] = [dict(field, indexed=field['indexed'] or
+                                     field['name'] in missing)
+                                for field in descriptor['fields']]
+        with self.pool.writer() as conn:
+            conn.executescript('BEGIN;' + ''.join([f'CREATE INDEX IF NOT EXISTS '
+                                                   f'{self.index_name(tname, name)} '
+                                                   f'ON {tname}({name});'
+                                                   for name in missing]))
+            conn.execute(f'INSERT OR REPLACE INTO {META_TABLE} '
+                         f'VALUES (\'table:\' || ?, ?)',
+                         (tname, json.dumps(descriptor)))
+            conn.commit()
+        for name in missing:
+            table.get_field(name).indexed = True
 
     def insert(self, tname, keys, values):
         """insert into table
@@ -143,17 +424,26 @@ class Database:
             tname: name of table
             keys: name of fields
             values: corresponding values"""
-        # revise values, as TEXT or CHAR() must be surrounded by a pair of ''
-        self.connect()
+        self.insert_many(tname, keys, [values])
+
+    def insert_many(self, tname, keys, rows):
+        """insert rows into table within one transaction
+        params:
+            tname: name of table
+            keys: name of fields
+            rows: list of values, each corresponds to keys"""
         table = self.tables[tname]
-        for idx, key in enumerate(keys):
-            values[idx] = table.revise_data(key, values[idx])
-        # start inserting
-        cursor = self.conn.cursor()
-        cursor.execute(f'INSERT INTO {tname} ({",".join(keys)}) '
-                       f'VALUES ({",".join(values)})')
-        self.conn.commit()
-        self.close()
+        rows = table.adapt_rows(keys, rows)
+        shape = ('insert', tuple(keys))
+        sql = table.sql.get(shape)
+        if sql is None:
+            sql = table.sql[shape] = (f'INSERT INTO {tname} ({",".join(keys)}) '
+                                      f'VALUES ({",".join("?" * len(keys))})')
+        with self.pool.writer() as conn:
+            conn.execute('BEGIN')
+            conn.executemany(sql, rows)
+            conn.commit()
+        self.clear_search_cache()
 
     def select(self, tname, columns=None):
         """select columns from table
@@ -162,16 +452,42 @@ class Database:
             columns: required fields, default all
         return:
             list<tuple of data>"""
-        self.connect()
-        # initialize columns
-        if columns is None:
-            columns = ['*']
-        cursor = self.conn.cursor()
-        cursor.execute(f'SELECT {",".join(columns)} from {tname}')
-        data = cursor.fetchall()
-        self.close()
+        with self.pool.reader() as conn:
+            data = conn.execute(self.select_sql(tname, columns)).fetchall()
         return data
 
+    def iter_select(self, tname, columns=None, chunk=1000):
+        """select columns from table and yield rows lazily, a connection
+           outside the pool is used so that the pool is not blocked by
+           unfinished iteration
+        params:
+            tname: name of table
+            columns: required fields, default all
+            chunk: number of rows fetched at a time"""
+        sql = self.select_sql(tname, columns)
+        conn = self.pool.open_reader()
+        try:
+            cursor = conn.execute(sql)
+            while True:
+                rows = cursor.fetchmany(chunk)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    def select_sql(self, tname, columns):
+        """return sql selecting columns from table
+        params:
+            tname: name of table
+            columns: required fields, None means all"""
+        table = self.tables[tname]
+        shape = ('select', None if columns is None else tuple(columns))
+        sql = table.sql.get(shape)
+        if sql is None:
+            sql = table.sql[shape] = f'SELECT {",".join(columns)} from {tname}'
+        return sql
+
     def search(self, tname, key, value, columns=None):
         """search by id in selected table
         params:
@@ -181,19 +497,50 @@ class Database:
             columns: required fields, default all
         return:
             tuple of values of selected columns"""
-        # initialize columns
-        self.connect()
-        if columns is None:
-            columns = ['*']
+        if columns is not None:
+            columns = tuple(columns)
+        if self._search_cache is None:
+            return self._search(tname, key, value, columns)
+        shape = (tname, key, value, columns)
+        data = self._search_cache.get(shape)
+        if data is None:
+            data = self._search_cache[shape] = self._search(tname, key, value, columns)
+            if len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+        else:
+            self._search_cache.move_to_end(shape)
+        return list(data)
 
+    def _search(self, tname, key, value, columns):
+        """search without cache, params are the same as search"""
         table = self.tables[tname]
-        cursor = self.conn.cursor()
-        cursor.execute(f'SELECT {",".join(columns)} from {tname} '
-                       f'where {key}={table.revise_data(key, value)}')
-        data = cursor.fetchall()
-        self.close()
+        shape = ('search', columns, key)
+        sql = table.sql.get(shape)
+        if sql is None:
+            sql = table.sql[shape] = (f'SELECT {",".join(columns)} from {tname} '
+                                      f'where {key}=?')
+        with self.pool.reader() as conn:
+            cursor = conn.execute(sql, (table.adapt_data(key, value),))
+            data = cursor.fetchall()
         return data
 
+    @classmethod
+    def range_condition(cls, key, start, end):
+        """where subcmd of value range, a bound of None means infinite,
+           only given bounds are compared so that index on key can be used
+        params:
+            key: name of field
+            start: left value of the field
+            end: right value of the field"""
+        conditions = []
+        if start is not None:
+            conditions.append(f'{key}>=?')
+        if end is not None:
+            conditions.append(f'{key}<=?')
+        if not conditions:
+            return ''
+        return 'where ' + ' and '.join(conditions)
+
     # pylint: disable=R0913
     def search_by_range(self, tname, key, start=None, end=None, columns=None):
         """search by value range
@@ -203,26 +550,17 @@ class Database:
             start: left value of the field
             end: right value of the field
             columns: selected columns"""
-        # initialize columns
-        self.connect()
-        if columns is None:
-            columns = ['*']
         table = self.tables[tname]
-        cursor = self.conn.cursor()
-        start_condition = f'{key}>={table.revise_data(key, str(start))}'
-        end_condition = f'{key}<={table.revise_data(key, str(end))}'
-        select_cmd = f'SELECT {",".join(columns)} from {tname}'
-        if start is None:
-            # delete until end
-            cursor.execute(select_cmd + f' where {end_condition};')
-        elif end is None:
-            # delete from start
-            cursor.execute(select_cmd + f' where {start_condition};')
-        else:
-            # delete in range(start, end)
-            cursor.execute(select_cmd + f' where {start_condition} and {end_condition};')
-        data = cursor.fetchall()
-        self.close()
+        # initialize columns
+        columns = ('*',) if columns is None else tuple(columns)
+        shape = ('search_by_range', columns, key, start is None, end is None)
+        sql = table.sql.get(shape)
+        if sql is None:
+            sql = table.sql[shape] = (f'SELECT {",".join(columns)} from {tname} '
+                                      f'{self.range_condition(key, start, end)}')
+        with self.pool.reader() as conn:
+            cursor = conn.execute(sql, table.range_params(key, start, end))
+            data = cursor.fetchall()
         return data
 
     # pylint:disable=R0913
@@ -234,20 +572,21 @@ class Database:
             values: list, updating values
             key: str, search key
             value: search value"""
-        self.connect()
         table = self.tables[tname]
-        # form update sequence
-        update_seq = ','.join([field + '=' + str(table.revise_data(field, values[idx]))
-                               for idx, field in enumerate(keys)])
-        # form where subcmd
-        where = ''
+        params = table.adapt_rows(keys, [values])[0]
         if key is not None:
-            where = f'where {key}={table.revise_data(key, value)}'
-        cursor = self.conn.cursor()
-        cursor.execute(f'UPDATE {tname} set '
-                       f'{update_seq} {where};')
-        self.conn.commit()
-        self.close()
+            params.append(table.adapt_data(key, value))
+        shape = ('update', tuple(keys), key)
+        sql = table.sql.get(shape)
+        if sql is None:
+            # form update sequence and where subcmd
+            update_seq = ','.join([field + '=?' for field in keys])
+            where = '' if key is None else f'where {key}=?'
+            sql = table.sql[shape] = f'UPDATE {tname} set {update_seq} {where};'
+        with self.pool.writer() as conn:
+            conn.execute(sql, params)
+            conn.commit()
+        self.clear_search_cache()
 
     def delete(self, tname, key, value):
         """delete certain rows
@@ -255,34 +594,45 @@ class Database:
             tname: name of table
             key: field name
             value: value of the field"""
-        self.connect()
         table = self.tables[tname]
-        cursor = self.conn.cursor()
-        cursor.execute(f'DELETE from {tname} '
-                       f'where {key}={table.revise_data(key, value)}')
-        self.conn.commit()
-        self.close()
+        with self.pool.writer() as conn:
+            conn.execute(table.sql[('delete', key)],
+                         (table.adapt_data(key, value),))
+            conn.commit()
+        self.clear_search_cache()
+
+    def delete_many(self, tname, key, values):
+        """delete rows matching any of values within one transaction
+        params:
+            tname: name of table
+            key: field name
+            values: list of values of the field"""
+        table = self.tables[tname]
+        rows = table.adapt_rows([key], [[value] for value in values])
+        with self.pool.writer() as conn:
+            conn.execute('BEGIN')
+            conn.executemany(table.sql[('delete', key)], rows)
+            conn.commit()
+        self.clear_search_cache()
 
     def delete_by_time(self, tname, time_key, start, end):
-        """delete certain rows by time range, None means infinite
+        """delete certain rows by time range, None means infinite, but start
+           and end cannot both be None
         params:
             tname: name of table
             time_key: str, field name of time stamp
             start: datetime, start time
             end: datetime, end time"""
-        self.connect()
+        if start is None and end is None:
+            raise ValueError('at least one of start and end is needed, '
+                             'otherwise all rows would be deleted')
         table = self.tables[tname]
-        cursor = self.conn.cursor()
-        start_condition = f'{time_key}>={table.revise_data(time_key, str(start))}'
-        end_condition = f'{time_key}<={table.revise_data(time_key, str(end))}'
-        if start is None:
-            # delete until end
-            cursor.execute(f'DELETE from {tname} where {end_condition}')
-        elif end is None:
-            # delete from start
-            cursor.execute(f'DELETE from {tname} where {start_condition}')
-        else:
-            # delete in range(start, end)
-            cursor.execute(f'DELETE from {tname} where {start_condition} and {end_condition}')
-        self.conn.commit()
-        self.close()
+        shape = ('delete_by_time', time_key, start is None, end is None)
+        sql = table.sql.get(shape)
+        if sql is None:
+            sql = table.sql[shape] = (f'DELETE from {tname} '
+                                      f'{self.range_condition(time_key, start, end)}')
+        with self.pool.writer() as conn:
+            conn.execute(sql, table.range_params(time_key, start, end))
+            conn.commit()
+        self.clear_search_cache()
@@ -41,11 +41,11 @@ class MsgWithTag:
     @classmethod
     def to_fields(cls):
         """turn class to list of fields"""
-        return [Field('msg', 'TEXT'),
+        return [Field('msg', 'TEXT', indexed=True),
                 Field('tags', 'TEXT'),
                 Field('talker', 'TEXT'),
                 Field('expiry', 'CHAR(30)'),
-                Field('time', 'CHAR(30)')]
+                Field('time', 'CHAR(30)', indexed=True)]
 
     @classmethod
     def get_time_key(cls):
@@ -22,12 +22,10 @@ class GroupchatAssistant(WechatyPlugin):
         """get the name of plugin"""
         return 'groupchat assistant'
 
-    def __init__(self, data_path='database.db', config_path='config.pkl'):
+    def __init__(self, data_path='database.db'):
         """params:
-            data_path: path of database file,
-            config_path: path of database config file, which
-                         contains auto-created information"""
-        self.plugins = [Tagging(data_path, config_path),
+            data_path: path of database file"""
+        self.plugins = [Tagging(data_path),
                         TimedTask(),
                         MemberManager(),
                         HelpSystem('帮助', '#', groupchat_bot_help_zh)]
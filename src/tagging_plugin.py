@@ -4,7 +4,6 @@
    display and cleaning function are also provided"""
 import re
 from typing import Union
-import pickle
 
 from wechaty import Message, Contact, Room
 from wechaty.plugin import WechatyPlugin
@@ -27,14 +26,11 @@ class Tagging(WechatyPlugin):
         """get the name of the plugin"""
         return 'tagging'
 
-    def __init__(self, data_path='database.db', config_path='config.pkl'):
+    def __init__(self, data_path='database.db'):
         """params:
-            data_path: path of database file,
-            config_path: path of database config file, which
-                         contains auto-created information"""
+            data_path: path of database file"""
         self.data_path = data_path
-        self.config_path = config_path
-        self.interface = DataTransfer(Database(data_path, config_path))
+        self.interface = DataTransfer(Database(data_path))
         self.question_answering = QuestionAnswering(self.interface)
         self.tag_controller = TagController(self.interface)
         self.display = Display(self.interface)
@@ -11,11 +11,10 @@ PATH = 'test.db'
 
 def test_create():
     """create table"""
-    for path in [PATH, 'database_config.pkl']:
-        try:
-            os.remove(path)
-        except FileNotFoundError:
-            pass
+    try:
+        os.remove(PATH)
+    except FileNotFoundError:
+        pass
     interface = DataTransfer(Database(PATH))
 
 def test_save_msg(msg='hahah', tag='test tag', talker='admin',
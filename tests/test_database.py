@@ -2,12 +2,14 @@
 # -*- coding:utf-8 -*-
 """test database class"""
 import os
+import sqlite3
+import weakref
 from datetime import datetime
-from data.database import Database, PrimaryKey, Field
+import pytest
+from data.database import Database, PrimaryKey, Field, ConnectionPool
 
 TABLE = "test_table"
 PATH = "test.db"
-config = 'database_config.pkl'
 
 def test_create():
     """create table"""
@@ -18,11 +20,24 @@ def test_create():
     database = Database(PATH)
     primary_key = PrimaryKey.id_as_primary()
     fields = [Field("msg", "TEXT"), Field("tags", "CHAR(50)"),
-              Field('time', 'CHAR(30)', others=[f'DEFAULT (\'{str(datetime.now())}\')'])]
+              Field('time', 'CHAR(30)', others=[f'DEFAULT (\'{str(datetime.now())}\')'],
+                    indexed=True)]
     database.create_table(TABLE, primary_key, fields)
     assert TABLE in database.tables.keys()
     database.close()
 
+def test_load_table():
+    """tables are rebuilt from stored descriptors when reopened"""
+    database = Database(PATH)
+    table = database.tables[TABLE]
+    assert table.get_primary_key().name == 'id'
+    assert table.get_all_fields_name() == ('id', 'msg', 'tags', 'time')
+    assert table.get_field('tags').dtype == 'CHAR(50)'
+    assert table.get_field('time').indexed and not table.get_field('msg').indexed
+    assert TABLE in database.get_all_tables_name()
+    assert '__meta' not in database.get_all_tables_name()
+    database.close()
+
 def test_insert():
     """insert data"""
     database = Database(PATH)
@@ -62,3 +77,197 @@ def test_delete_by_time():
     end = datetime.now()
     database.delete_by_time(TABLE, 'time', start, end)
     assert len(database.select(TABLE)) == data_num
+
+def test_insert_many():
+    """test inserting multiple rows at once"""
+    database = Database(PATH)
+    data_num = len(database.select(TABLE))
+    database.insert_many(TABLE, ["msg", "tags"],
+                         [["it's bulk", "bulk"], ["bulk again", "bulk"]])
+    assert len(database.select(TABLE)) == data_num + 2
+    assert database.search(TABLE, 'tags', 'bulk')[0][1] == "it's bulk"
+
+def test_read_only_reader():
+    """connections for reading cannot modify data"""
+    database = Database(PATH)
+    with database.pool.reader() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute(f'DELETE from {TABLE}')
+    database.close()
+
+def test_search_cache():
+    """cached search results are refreshed after modification"""
+    database = Database(PATH, cache=True)
+    assert len(database.search(TABLE, 'tags', 'cached')) == 0
+    database.insert(TABLE, ["msg", "tags"], ["cache me", "cached"])
+    assert len(database.search(TABLE, 'tags', 'cached')) == 1
+    database.delete(TABLE, 'tags', 'cached')
+    assert len(database.search(TABLE, 'tags', 'cached')) == 0
+    database.close()
+
+def test_released_without_gc():
+    """dropped database is freed by reference counting"""
+    database = Database(PATH, cache=True)
+    ref = weakref.ref(database)
+    del database
+    assert ref() is None
+
+def test_delete_many():
+    """test deleting multiple rows at once"""
+    database = Database(PATH)
+    database.insert_many(TABLE, ["msg", "tags"],
+                         [["first", "delete many"], ["second", "delete many"]])
+    data_num = len(database.select(TABLE))
+    database.delete_many(TABLE, 'msg', ['first', 'second', 'no such msg'])
+    assert len(database.select(TABLE)) == data_num - 2
+    database.close()
+
+def test_index():
+    """fields declared as indexed are indexed"""
+    database = Database(PATH)
+    with database.pool.reader() as conn:
+        indexes = conn.execute(f'PRAGMA index_list({TABLE})').fetchall()
+    assert f'idx_{TABLE}_time' in [index[1] for index in indexes]
+    # range queries on time are bounded by the index
+    now = datetime.now()
+    for start, end in [(now, None), (None, now), (now, now)]:
+        condition = Database.range_condition('time', start, end)
+        params = database.tables[TABLE].range_params('time', start, end)
+        for cmd in [f'SELECT * from {TABLE}', f'DELETE from {TABLE}']:
+            with database.pool.reader() as conn:
+                plan = conn.execute(f'EXPLAIN QUERY PLAN {cmd} {condition}',
+                                    params).fetchall()
+            assert f'USING INDEX idx_{TABLE}_time' in plan[0][-1]
+    database.close()
+
+def test_iter_select():
+    """test selecting rows lazily"""
+    database = Database(PATH)
+    assert list(database.iter_select(TABLE, ['id'], chunk=1)) == database.select(TABLE, ['id'])
+    database.close()
+
+def test_iter_select_not_blocking():
+    """unfinished iteration does not hold connections of pool"""
+    database = Database(PATH, readers=1)
+    rows = database.iter_select(TABLE, chunk=1)
+    next(rows)
+    assert len(database.search(TABLE, 'id', 2)) == 1
+    rows.close()
+    database.close()
+
+def test_save_tables():
+    """descriptors of tables rebuilt from sqlite schema are saved on close"""
+    database = Database(PATH)
+    with database.pool.writer() as conn:
+        conn.execute('CREATE TABLE legacy_table (id INTEGER PRIMARY KEY, msg TEXT)')
+        conn.commit()
+    database.close()
+    database = Database(PATH)
+    assert 'legacy_table' in database.get_all_tables_name()
+    database.close()
+    database = Database(PATH)
+    assert not database._tables_dirty
+    database.close()
+
+def test_create_existing():
+    """failed table creation leaves nothing behind"""
+    database = Database(PATH)
+    with pytest.raises(sqlite3.OperationalError):
+        database.create_table(TABLE, PrimaryKey.id_as_primary(), [Field("msg", "TEXT")])
+    database.insert(TABLE, ["msg", "tags"], ["still writable", "after failure"])
+    assert len(database.search(TABLE, 'tags', 'after failure')) == 1
+    database.close()
+
+def test_closed():
+    """closed database raises error and leaves no WAL file behind"""
+    path = 'test_closed.db'
+    database = Database(path)
+    database.close()
+    assert not os.path.exists(f'{path}-wal')
+    assert not os.path.exists(f'{path}-shm')
+    with pytest.raises(sqlite3.ProgrammingError):
+        database.create_table(TABLE, PrimaryKey.id_as_primary(), [Field("msg", "TEXT")])
+    with pytest.raises(sqlite3.ProgrammingError):
+        with database.pool.reader():
+            pass
+    os.remove(path)
+
+def test_ensure_indexes():
+    """indexes are added to tables created without them"""
+    database = Database(PATH)
+    with database.pool.writer() as conn:
+        conn.execute('CREATE TABLE unindexed_table (id INTEGER PRIMARY KEY, msg TEXT)')
+        conn.commit()
+    database.close()
+    database = Database(PATH)
+    database.ensure_indexes('unindexed_table', [Field('msg', 'TEXT', indexed=True)])
+    database.close()
+    database = Database(PATH)
+    assert database.tables['unindexed_table'].get_field('msg').indexed
+    with database.pool.reader() as conn:
+        indexes = conn.execute('PRAGMA index_list(unindexed_table)').fetchall()
+    assert 'idx_unindexed_table_msg' in [index[1] for index in indexes]
+    database.close()
+
+def test_ensure_indexes_failed():
+    """indexes of unknown fields are reported and nothing is changed"""
+    database = Database(PATH)
+    with pytest.raises(ValueError):
+        database.ensure_indexes(TABLE, [Field('msg', 'TEXT', indexed=True),
+                                        Field('no_such_field', 'TEXT', indexed=True)])
+    assert not database.tables[TABLE].get_field('msg').indexed
+    database.close()
+
+def test_pool_exhausted():
+    """borrowing from an exhausted pool raises error instead of waiting forever"""
+    with pytest.raises(ValueError):
+        ConnectionPool(PATH, readers=0)
+    pool = ConnectionPool(PATH, readers=1, timeout=0.1)
+    with pool.reader():
+        with pytest.raises(sqlite3.OperationalError):
+            with pool.reader():
+                pass
+    with pool.writer():
+        with pytest.raises(sqlite3.OperationalError):
+            with pool.writer():
+                pass
+    pool.close()
+
+def test_skip_unknown_tables():
+    """tables without a single primary key column are skipped"""
+    database = Database(PATH)
+    with database.pool.writer() as conn:
+        conn.execute('CREATE TABLE no_primary (msg TEXT)')
+        conn.execute('CREATE TABLE composite_primary '
+                     '(msg TEXT, tags TEXT, PRIMARY KEY (msg, tags))')
+        conn.commit()
+    database.close()
+    database = Database(PATH)
+    assert 'no_primary' not in database.get_all_tables_name()
+    assert 'composite_primary' not in database.get_all_tables_name()
+    assert TABLE in database.get_all_tables_name()
+    database.close()
+
+def test_dropped_table():
+    """descriptors of tables dropped outside Database are removed"""
+    database = Database(PATH)
+    database.create_table('dropped_table', PrimaryKey.id_as_primary(), [Field("msg", "TEXT")])
+    with database.pool.writer() as conn:
+        conn.execute('DROP TABLE dropped_table')
+        conn.commit()
+    database.close()
+    database = Database(PATH)
+    assert 'dropped_table' not in database.get_all_tables_name()
+    with database.pool.reader() as conn:
+        assert not conn.execute('SELECT key from __meta where key=?',
+                                ('table:dropped_table',)).fetchall()
+    database.close()
+
+def test_delete_by_time_unbounded():
+    """deleting by time without any bound is refused"""
+    database = Database(PATH)
+    data_num = len(database.select(TABLE))
+    with pytest.raises(ValueError):
+        database.delete_by_time(TABLE, 'time', None, None)
+    assert len(database.select(TABLE)) == data_num
+    database.close()
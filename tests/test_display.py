@@ -9,7 +9,6 @@ from data.msg_with_tag import MsgWithTag
 from tagging_modules import reply
 
 PATH = "test.db"
-CONFIG = 'database_config.pkl'
 
 MSG_CONTENTS = [('今天19点开会', '今天开会时间'),
                 ('请大家8点前完成问卷填写', '问卷截止时间'),
@@ -19,12 +18,11 @@ MSG_CONTENTS = [('今天19点开会', '今天开会时间'),
 
 def init_data():
     """create tag_controller"""
-    for path in [PATH, CONFIG]:
-        try:
-            os.remove(path)
-        except FileNotFoundError:
-            pass
-    interface = DataTransfer(Database(PATH, CONFIG))
+    try:
+        os.remove(PATH)
+    except FileNotFoundError:
+        pass
+    interface = DataTransfer(Database(PATH))
     for quoted, tag, in MSG_CONTENTS:
         msg = MsgWithTag(quoted, tag, 'me', create_time=datetime.now())     # talker is not important here
         interface.save_msg(msg)
@@ -35,7 +33,7 @@ def test_display_msg():
     start = datetime.now()
     init_data()
     end = datetime.now()
-    interface = DataTransfer(Database(PATH, CONFIG))
+    interface = DataTransfer(Database(PATH))
     display = Display(interface)
     assert display.handle_msg(KEY_DISPLAY, True)
     assert len(display.reply.split('\n')) == len(MSG_CONTENTS)
@@ -1,6 +1,7 @@
 #!/usr/bin/python
 # -*- coding:utf-8 -*-
 """unit test for help system"""
+import pytest
 from help_modules.help import Help
 from help_modules.example_dict import groupchat_bot_help_zh
 
@@ -14,12 +15,14 @@ def test_help_all():
     assert HELP.handle_msg(f'{KEY_HELP}', True)
     assert HELP.get_reply() == HELP.all()
 
-def test_help_individual():
+@pytest.mark.parametrize('key', list(HELP.help_dict))
+def test_help_individual(key):
     """test doc of individual function"""
-    for key in HELP.help_dict:
-        assert HELP.handle_msg(f'{KEY_HELP} {KEY_SPLIT}{key}', True)
-        assert HELP.get_reply() == HELP.help_dict[key]
+    assert HELP.handle_msg(f'{KEY_HELP} {KEY_SPLIT}{key}', True)
+    assert HELP.get_reply() == HELP.help_dict[key]
 
+def test_help_no_such_method():
+    """test doc of unknown function"""
     false_keyword = 'no such key word'
     assert HELP.handle_msg(f'{KEY_HELP}{KEY_SPLIT}{false_keyword}', True)
     assert HELP.get_reply() == HELP.no_such_method()
@@ -8,7 +8,6 @@ from tagging_modules import reply
 from tagging_modules.question_answering import QuestionAnswering
 
 PATH = "test.db"
-CONFIG = 'database_config.pkl'
 
 MSG_CONTENTS = [('今天19点开会', '今天开会时间'),
                 ('请大家8点前完成问卷填写', '问卷截止时间'),
@@ -18,12 +17,11 @@ MSG_CONTENTS = [('今天19点开会', '今天开会时间'),
 
 def init_data():
     """create tag_controller"""
-    for path in [PATH, CONFIG]:
-        try:
-            os.remove(path)
-        except FileNotFoundError:
-            pass
-    interface = DataTransfer(Database(PATH, CONFIG))
+    try:
+        os.remove(PATH)
+    except FileNotFoundError:
+        pass
+    interface = DataTransfer(Database(PATH))
     for quoted, tag, in MSG_CONTENTS:
         msg = MsgWithTag(quoted, tag, 'me')     # talker is not important here
         interface.save_msg(msg)
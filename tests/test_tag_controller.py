@@ -9,21 +9,19 @@ from data.data_transfer import DataTransfer
 from tagging_modules import reply
 
 PATH = "test.db"
-CONFIG = 'database_config.pkl'
 
 def test_create():
     """create tag_controller"""
-    for path in [PATH, CONFIG]:
-        try:
-            os.remove(path)
-        except FileNotFoundError:
-            pass
-    controller = TagController(DataTransfer(Database(PATH, CONFIG)))
+    try:
+        os.remove(PATH)
+    except FileNotFoundError:
+        pass
+    controller = TagController(DataTransfer(Database(PATH)))
 
 
 def test_not_reply():
     """not saying to the bot"""
-    controller = TagController(DataTransfer(Database(PATH, CONFIG)))
+    controller = TagController(DataTransfer(Database(PATH)))
     reply = controller.handle_msg(quoted='null', msg='null', talker='me', to_bot=False)
     assert not reply
 